@@ -1,14 +1,43 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from bs4.dammit import EncodingDetector
+import lxml.html
+from lxml import etree
 import re
+import codecs
 import json
 import importlib
 from urllib.parse import urlparse
 import os
+from pathlib import Path
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 import logging
 import asyncio
+import functools
+import hashlib
+import tempfile
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax es opcional, se usa lxml o BeautifulSoup en su lugar
+    LexborHTMLParser = None
+
+try:
+    import aiohttp
+except ImportError:  # sin aiohttp las URLs se descargan de una en una
+    aiohttp = None
+
+try:
+    import rusty_req
+except ImportError:  # cliente HTTP en Rust opcional, si no se usa aiohttp
+    rusty_req = None
+
+try:
+    import orjson
+except ImportError:  # sin orjson se exporta con el módulo json estándar
+    orjson = None
 
 # Configuración de logging
 logging.basicConfig(
@@ -17,13 +46,253 @@ logging.basicConfig(
 )
 logger = logging.getLogger('scraper_manager')
 
+# Parser de BeautifulSoup (lxml es mucho más rápido que html.parser)
+BS_PARSER = os.environ.get("ACEWEB_BS_PARSER", "lxml")
+
+# Cabeceras enviadas en todas las peticiones HTTP
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+# Tiempo máximo (segundos) de conexión y de lectura de cada petición
+REQUEST_TIMEOUT = 10
+
+# Caché en disco de las páginas descargadas, para hacer peticiones condicionales
+# (una cadena vacía en ACEWEB_HTTP_CACHE la desactiva)
+HTTP_CACHE_DIR = os.environ.get("ACEWEB_HTTP_CACHE", os.path.join("resources", "http_cache"))
+# Número máximo de páginas guardadas (se borran primero las más antiguas)
+HTTP_CACHE_MAX_ENTRIES = 100
+
+# Patrones precompilados usados por los scrapers
+# Horas en formato HH:MM
+_TIME_RE = re.compile(r'\d{2}:\d{2}')
+
+# Expresiones XPath precompiladas para el árbol de lxml
+_CLASS_TEST = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+_ROJA_MENU_XPATH = etree.XPath(f"//ul[{_CLASS_TEST.format('menu')}]/li")
+_ROJA_TIME_XPATH = etree.XPath(f".//span[{_CLASS_TEST.format('t')}]")
+# Texto de un enlace sin el de la hora (incluye lo que sigue al span)
+_ROJA_TITLE_XPATH = etree.XPath(f".//text()[not(ancestor::span[{_CLASS_TEST.format('t')}])]",
+                                smart_strings=False)
+_ROJA_CHANNEL_XPATH = etree.XPath(f".//li[{_CLASS_TEST.format('subitem1')}]")
+_DADDY_EVENT_XPATH = etree.XPath("//strong")
+_DADDY_LINK_XPATH = etree.XPath(".//a")
+
+@functools.lru_cache(maxsize=256)
+def _netloc(url: str) -> str:
+    """Dominio de una URL (las mismas URLs se consultan muchas veces)"""
+    return urlparse(url).netloc
+
+
+def _valid_encoding(label: Optional[str]) -> Optional[str]:
+    """Devolver el charset recibido si es una codificación conocida, o None"""
+    if not label:
+        return None
+    label = label.strip()
+    try:
+        codecs.lookup(label)
+    except LookupError:
+        logger.warning(f"Charset desconocido, se ignora: {label}")
+        return None
+    return label
+
+
+def _resolve_encoding(content: bytes, encoding: Optional[str]) -> str:
+    """Codificación de un documento: la del servidor, la de su <meta> o UTF-8"""
+    encoding = _valid_encoding(encoding)
+    if not encoding:
+        encoding = _valid_encoding(EncodingDetector.find_declared_encoding(content, is_html=True))
+    return encoding or 'utf-8'
+
+
+def _build_session() -> requests.Session:
+    """Crear una sesión HTTP con keep-alive compartida por todos los scrapers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def _cache_paths(url: str) -> Tuple[str, str]:
+    """Rutas de los metadatos (JSON) y del cuerpo de una URL en la caché"""
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    base = os.path.join(HTTP_CACHE_DIR, key)
+    return f"{base}.json", f"{base}.body"
+
+
+def _write_atomic(path: str, data: bytes):
+    """Escribir en un temporal y reemplazar para no dejar el archivo a medias"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def _cache_entry(url: str) -> Optional[Dict[str, Any]]:
+    """Metadatos guardados (ETag, Last-Modified, charset) de una URL"""
+    if not HTTP_CACHE_DIR:
+        return None
+    meta_path, body_path = _cache_paths(url)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"No se pudo leer la caché HTTP de {url}: {str(e)}")
+        return None
+    if entry.get('url') != url:
+        return None
+    if not os.path.exists(body_path):
+        # Sin el cuerpo la entrada no sirve: no hay que enviar cabeceras condicionales
+        _drop_cache_entry(url)
+        return None
+    return entry
+
+
+def _drop_cache_entry(url: str):
+    """Borrar de la caché la entrada de una URL"""
+    for path in _cache_paths(url):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"No se pudo borrar la caché HTTP de {url}: {str(e)}")
+
+
+def _conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Cabeceras If-None-Match / If-Modified-Since para una entrada de la caché"""
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def _cached_body(url: str, entry: Optional[Dict[str, Any]]) -> Optional[Tuple[bytes, Optional[str]]]:
+    """Cuerpo y charset guardados para una URL (tras un 304 Not Modified)"""
+    if not entry:
+        return None
+    _, body_path = _cache_paths(url)
+    try:
+        return Path(body_path).read_bytes(), entry.get('encoding')
+    except Exception as e:
+        logger.warning(f"No se pudo leer la caché HTTP de {url}: {str(e)}")
+        return None
+
+
+def _cache_response(url: str, headers, body: bytes, encoding: Optional[str]):
+    """Guardar una respuesta en la caché si el servidor permite validarla"""
+    etag = headers.get('ETag')
+    last_modified = headers.get('Last-Modified')
+    if not HTTP_CACHE_DIR or (not etag and not last_modified):
+        return
+
+    meta_path, body_path = _cache_paths(url)
+    entry = {
+        'url': url,
+        'etag': etag,
+        'last_modified': last_modified,
+        'encoding': encoding
+    }
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        # El cuerpo se escribe antes que los metadatos, que marcan la entrada como válida
+        _write_atomic(body_path, body)
+        _write_atomic(meta_path, json.dumps(entry).encode('utf-8'))
+        _prune_http_cache()
+    except Exception as e:
+        logger.warning(f"No se pudo guardar la caché HTTP de {url}: {str(e)}")
+
+
+def _prune_http_cache():
+    """Borrar las entradas más antiguas si la caché supera HTTP_CACHE_MAX_ENTRIES"""
+    meta_paths = [entry.path for entry in os.scandir(HTTP_CACHE_DIR) if entry.name.endswith('.json')]
+    if len(meta_paths) <= HTTP_CACHE_MAX_ENTRIES:
+        return
+
+    meta_paths.sort(key=os.path.getmtime)
+    for meta_path in meta_paths[:len(meta_paths) - HTTP_CACHE_MAX_ENTRIES]:
+        for path in (meta_path, meta_path[:-len('.json')] + '.body'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
 class BaseScraper(ABC):
     """Clase base abstracta para todos los scrapers"""
+
+    # Los scrapers que saben trabajar sobre el árbol de selectolax lo activan
+    use_fast_parser = False
+
+    # Sesión compartida para reutilizar las conexiones TCP/TLS
+    _session = _build_session()
     
     def __init__(self, url: str):
         self.url = url
         self.html_content = None
-        self.soup = None
+        self.encoding = None
+        # Árbol de selectolax (solo si use_fast_parser y selectolax instalado)
+        self.tree = None
+        # Árboles de BeautifulSoup y lxml, se construyen la primera vez que se usan
+        self._soup = None
+        self._lxml_tree = None
+
+    def _parse(self, encoding: Optional[str] = None):
+        """Preparar el HTML cargado para hacer scraping
+
+        html_content puede ser texto o bytes; en este último caso encoding es
+        la codificación declarada por el servidor (si la hay). Si no la hay se
+        usa la declarada en el propio HTML y, en último caso, UTF-8.
+        """
+        if isinstance(self.html_content, bytes):
+            encoding = _resolve_encoding(self.html_content, encoding)
+        self.encoding = encoding
+        self.tree = None
+        self._soup = None
+        self._lxml_tree = None
+
+        if self.use_fast_parser and LexborHTMLParser is not None:
+            content = self.html_content
+            # lexbor interpreta los bytes como UTF-8 (ignora el <meta charset>)
+            if isinstance(content, bytes) and codecs.lookup(encoding).name != 'utf-8':
+                content = content.decode(encoding, errors='replace')
+            self.tree = LexborHTMLParser(content)
+
+    @property
+    def soup(self) -> Optional[BeautifulSoup]:
+        """Árbol de BeautifulSoup del HTML cargado"""
+        if self._soup is None and self.html_content is not None:
+            if isinstance(self.html_content, bytes):
+                self._soup = BeautifulSoup(self.html_content, BS_PARSER, from_encoding=self.encoding)
+            else:
+                self._soup = BeautifulSoup(self.html_content, BS_PARSER)
+        return self._soup
+
+    @property
+    def lxml_tree(self) -> Optional[lxml.html.HtmlElement]:
+        """Árbol de lxml del HTML cargado (permite usar XPath)"""
+        if self._lxml_tree is None and self.html_content is not None:
+            try:
+                parser = None
+                if isinstance(self.html_content, bytes):
+                    # Codificación ya resuelta en _parse (servidor, <meta> o UTF-8)
+                    parser = lxml.html.HTMLParser(encoding=self.encoding)
+                self._lxml_tree = lxml.html.document_fromstring(self.html_content, parser=parser)
+            except Exception as e:
+                logger.error(f"Error al analizar HTML con lxml: {str(e)}")
+        return self._lxml_tree
 
 
     
@@ -31,12 +300,28 @@ class BaseScraper(ABC):
     def load_from_url(self) -> bool:
         """Cargar HTML desde URL"""
         try:
-            response = requests.get(self.url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            if response.status_code == 200:
-                self.html_content = response.text
-                self.soup = BeautifulSoup(self.html_content, 'html.parser')
+            entry = _cache_entry(self.url)
+            response = self._session.get(self.url, headers=_conditional_headers(entry),
+                                         timeout=REQUEST_TIMEOUT)
+            cached = None
+            if response.status_code == 304:
+                cached = _cached_body(self.url, entry)
+                if not cached:
+                    # La copia guardada no se puede usar: se descarta y se pide la página entera
+                    _drop_cache_entry(self.url)
+                    response = self._session.get(self.url, timeout=REQUEST_TIMEOUT)
+            if cached:
+                # La página no ha cambiado: se reutiliza la copia guardada
+                self.html_content, encoding = cached
+                self._parse(encoding)
+                return True
+            elif response.status_code == 200:
+                # Se parsean los bytes directamente para no decodificar dos veces
+                content_type = response.headers.get('Content-Type', '')
+                encoding = _valid_encoding(response.encoding) if 'charset' in content_type else None
+                self.html_content = response.content
+                _cache_response(self.url, response.headers, self.html_content, encoding)
+                self._parse(encoding)
                 return True
             else:
                 logger.error(f"Error al obtener URL {self.url}: {response.status_code}")
@@ -45,11 +330,11 @@ class BaseScraper(ABC):
             logger.error(f"Excepción al cargar URL {self.url}: {str(e)}")
             return False
     
-    def load_from_html(self, html_content: str) -> bool:
-        """Cargar HTML desde una cadena"""
+    def load_from_html(self, html_content: Union[str, bytes], encoding: Optional[str] = None) -> bool:
+        """Cargar HTML desde una cadena (o desde bytes con su codificación)"""
         try:
             self.html_content = html_content
-            self.soup = BeautifulSoup(self.html_content, 'html.parser')
+            self._parse(encoding)
             return True
         except Exception as e:
             logger.error(f"Error al analizar HTML: {str(e)}")
@@ -58,10 +343,10 @@ class BaseScraper(ABC):
     def load_from_file(self, filepath: str) -> bool:
         """Cargar HTML desde un archivo"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                self.html_content = file.read()
-                self.soup = BeautifulSoup(self.html_content, 'html.parser')
-                return True
+            # Los parsers trabajan directamente sobre los bytes del archivo
+            self.html_content = Path(filepath).read_bytes()
+            self._parse('utf-8')
+            return True
         except Exception as e:
             logger.error(f"Error al cargar archivo {filepath}: {str(e)}")
             return False
@@ -71,55 +356,68 @@ class BaseScraper(ABC):
         """Método abstracto que cada scraper debe implementar"""
         pass
 
+def _text_without_time(node) -> str:
+    """Texto de un nodo de selectolax omitiendo sus <span class="t">"""
+    parts = []
+    for child in node.iter(include_text=True):
+        if child.tag == '-text':
+            parts.append(child.text())
+        elif child.tag == 'span' and 't' in (child.attributes.get('class') or '').split():
+            continue
+        else:
+            parts.append(_text_without_time(child))
+    return ''.join(parts)
+
+
 class RojadirectaScraper(BaseScraper):
     """Scraper específico para Rojadirecta"""
+
+    use_fast_parser = True
     
     def scrape(self) -> List[Dict[str, Any]]:
         """Extraer eventos deportivos de Rojadirecta"""
-        if not self.soup:
+        if self.tree is not None:
+            return self._scrape_tree()
+
+        if self.lxml_tree is None:
             logger.error("No se ha cargado el HTML antes de intentar scraping")
             return []
         
         events = []
         
         # Buscar todos los elementos li de la clase menu
-        menu_items = self.soup.select("ul.menu > li")
+        menu_items = _ROJA_MENU_XPATH(self.lxml_tree)
         
         for item in menu_items:
             # Extraer el país/liga (está en la clase del li)
-            country_class = item.get('class', [''])[0] if item.get('class') else ''
+            classes = item.get('class', '').split()
+            country_class = classes[0] if classes else ''
             
             # Extraer el título del evento y la hora
-            event_link = item.find('a')
-            if not event_link:
+            # (los elementos de lxml sin hijos son falsos, hay que comparar con None)
+            event_link = item.find('.//a')
+            if event_link is None:
                 continue
-                
-            event_title = event_link.get_text().strip()
-            
-            # Eliminar la hora del título
-            time_match = re.search(r'(.+?)(?:<span class="t">(\d+:\d+)</span>)', str(event_link))
             
-            if time_match:
-                event_title = time_match.group(1).strip()
-                event_time = time_match.group(2)
+            # La hora está en un span dentro del enlace
+            # (el árbol no se modifica: scrape puede llamarse más de una vez)
+            time_spans = _ROJA_TIME_XPATH(event_link)
+            if time_spans:
+                event_time = time_spans[0].text_content().strip()
             else:
-                # Si no hay formato de hora en span, intentar extraer de otra manera
-                time_span = event_link.find('span', class_='t')
-                event_time = time_span.text if time_span else "No especificado"
-                # Limpiar el título si la hora está incluida
-                event_title = event_title.replace(event_time, '').strip()
+                event_time = "No especificado"
                 
-            event_title = event_title.replace('<a href="#">', '')
+            event_title = ''.join(_ROJA_TITLE_XPATH(event_link)).strip()
             
             # Extraer los canales disponibles
             channels = []
-            channel_items = item.find('ul')
+            channel_items = item.find('.//ul')
             
-            if channel_items:
-                for channel in channel_items.find_all('li', class_='subitem1'):
-                    channel_link = channel.find('a')
-                    if channel_link:
-                        channel_name = channel_link.text.strip()
+            if channel_items is not None:
+                for channel in _ROJA_CHANNEL_XPATH(channel_items):
+                    channel_link = channel.find('.//a')
+                    if channel_link is not None:
+                        channel_name = channel_link.text_content().strip()
                         channel_url = channel_link.get('href', '')
                         channels.append({
                             'name': channel_name,
@@ -138,53 +436,98 @@ class RojadirectaScraper(BaseScraper):
         
         return events
 
+    def _scrape_tree(self) -> List[Dict[str, Any]]:
+        """Extraer eventos deportivos de Rojadirecta usando selectolax"""
+        events = []
+
+        for item in self.tree.css("ul.menu > li"):
+            # Extraer el país/liga (está en la clase del li)
+            classes = (item.attributes.get('class') or '').split()
+            country_class = classes[0] if classes else ''
+
+            # Extraer el título del evento y la hora
+            event_link = item.css_first('a')
+            if event_link is None:
+                continue
+
+            time_span = event_link.css_first('span.t')
+            if time_span is not None:
+                event_time = time_span.text(strip=True)
+            else:
+                event_time = "No especificado"
+            # El título es el texto del enlace sin la hora (sin modificar el árbol)
+            event_title = _text_without_time(event_link).strip()
+
+            # Extraer los canales disponibles
+            channels = []
+            channel_items = item.css_first('ul')
+
+            if channel_items is not None:
+                for channel in channel_items.css('li.subitem1'):
+                    channel_link = channel.css_first('a')
+                    if channel_link is not None:
+                        channels.append({
+                            'name': channel_link.text().strip(),
+                            'url': channel_link.attributes.get('href') or ''
+                        })
+
+            events.append({
+                'country_league': country_class,
+                'title': event_title,
+                'time': event_time,
+                'channels': channels
+            })
+
+        return events
+
 class DaddyLiveScraper(BaseScraper):
     """Scraper específico para DaddyLive"""
-    
+
+    use_fast_parser = True
     
     def scrape(self) -> List[Dict[str, Any]]:
         """Extraer eventos deportivos de DaddyLive"""
-        if not self.soup:
+        if self.tree is not None:
+            return self._scrape_tree()
+
+        if self.lxml_tree is None:
             logger.error("No se ha cargado el HTML antes de intentar scraping")
             return []
         
         events = []
-        channels = []
-    
-        # Patrón para identificar horas en formato HH:MM
-        time_pattern = re.compile(r'\d{2}:\d{2}')
         
-        # Buscar todos los elementos <strong>
-        strongs = self.soup.find_all('strong')
+        # Buscar todos los elementos <strong> (XPath y text_content se ejecutan en C)
+        strongs = _DADDY_EVENT_XPATH(self.lxml_tree)
         
         for strong in strongs:
             # Convertir el contenido del strong a texto
-            texto_completo = strong.get_text()
+            texto_completo = strong.text_content()
             
             # Verificar si contiene un horario en formato HH:MM
-            match = time_pattern.search(texto_completo)
+            match = _TIME_RE.search(texto_completo)
             
             if match:
                 # Obtener la hora
                 hora = match.group(0)
                 
                 # Extraer título del evento (todo lo que está entre la hora y el primer enlace)
-                titulo_inicio = texto_completo.index(hora) + len(hora)
+                titulo_inicio = match.end()
                 titulo_fin = len(texto_completo)
                 
-                # Buscar los enlaces dentro del strong
-                canales = []
-                
-                for link in strong.find_all('a'):
-                    canales.append(link.get_text())
-                    channels.append({
-                            'name': link.get_text(),
-                            'url': link.get('href')
-                        })
+                # Buscar los enlaces dentro del strong (en orden de documento)
+                anchors = _DADDY_LINK_XPATH(strong)
+                canales = [link.text_content() for link in anchors]
+                channels = [
+                    {'name': nombre, 'url': link.get('href')}
+                    for nombre, link in zip(canales, anchors)
+                ]
                 
-                # Si hay enlaces, ajustar donde termina el título
+                # Si hay enlaces, el título termina donde empieza el primero
+                # (el canal se busca a partir de la hora, no desde el principio)
                 if canales:
-                    titulo_fin = texto_completo.index(canales[0]) - 1  # -1 para quitar el espacio antes del canal
+                    canal_inicio = texto_completo.find(canales[0], titulo_inicio)
+                    if canal_inicio != -1:
+                        titulo_fin = canal_inicio - 1  # -1 para quitar el espacio antes del canal
                 
                 titulo = texto_completo[titulo_inicio:titulo_fin].strip()
 
@@ -196,12 +539,145 @@ class DaddyLiveScraper(BaseScraper):
                 }
                 
                 events.append(event_info)
-                channels = []
                 
 
         
         return events
 
+    def _scrape_tree(self) -> List[Dict[str, Any]]:
+        """Extraer eventos deportivos de DaddyLive usando selectolax"""
+        events = []
+
+        for strong in self.tree.css('strong'):
+            texto_completo = strong.text()
+
+            match = _TIME_RE.search(texto_completo)
+            if not match:
+                continue
+
+            hora = match.group(0)
+            titulo_inicio = match.end()
+            titulo_fin = len(texto_completo)
+
+            anchors = strong.css('a')
+            canales = [link.text() for link in anchors]
+            channels = [
+                {'name': nombre, 'url': link.attributes.get('href')}
+                for nombre, link in zip(canales, anchors)
+            ]
+
+            # Si hay enlaces, el título termina donde empieza el primero
+            if canales:
+                canal_inicio = texto_completo.find(canales[0], titulo_inicio)
+                if canal_inicio != -1:
+                    titulo_fin = canal_inicio - 1
+
+            events.append({
+                'country_league': "",
+                'title': texto_completo[titulo_inicio:titulo_fin].strip(),
+                'time': hora,
+                'channels': channels
+            })
+
+        return events
+
+
+async def _fetch(session, url: str, headers: Dict[str, str]) -> Optional[Tuple[int, bytes, Optional[str], Dict[str, Optional[str]]]]:
+    """Descargar el HTML de una URL con una sesión de aiohttp
+
+    Devuelve el código de estado (200 o 304), el cuerpo sin decodificar, el
+    charset indicado por el servidor y sus cabeceras de validación de caché.
+    """
+    try:
+        async with session.get(url, headers=headers) as response:
+            if response.status in (200, 304):
+                validators = {
+                    'ETag': response.headers.get('ETag'),
+                    'Last-Modified': response.headers.get('Last-Modified')
+                }
+                charset = _valid_encoding(response.charset)
+                return response.status, await response.read(), charset, validators
+            logger.error(f"Error al obtener URL {url}: {response.status}")
+    except Exception as e:
+        logger.error(f"Excepción al cargar URL {url}: {str(e)}")
+    return None
+
+
+def _resolve_responses(urls: List[str], responses, entries: Dict[str, Optional[Dict[str, Any]]]) -> Tuple[Dict[str, Tuple[bytes, Optional[str]]], List[str]]:
+    """Obtener el cuerpo de cada respuesta (de la caché si es un 304) y actualizar la caché
+
+    Devuelve también las URLs que respondieron 304 pero cuya copia guardada no
+    se pudo leer; su entrada se borra para volver a pedirlas sin condiciones.
+    """
+    bodies = {}
+    stale = []
+    for url, response in zip(urls, responses):
+        if response is None:
+            continue
+
+        status, body, charset, validators = response
+        if status == 304:
+            cached = _cached_body(url, entries[url])
+            if cached:
+                bodies[url] = cached
+            elif entries[url]:
+                _drop_cache_entry(url)
+                stale.append(url)
+            else:
+                logger.error(f"Error al obtener URL {url}: {status}")
+        else:
+            _cache_response(url, validators, body, charset)
+            bodies[url] = (body, charset)
+    return bodies, stale
+
+
+async def _fetch_all_aiohttp(urls: List[str]) -> Dict[str, Tuple[bytes, Optional[str]]]:
+    """Descargar varias URLs en paralelo con una sesión compartida de aiohttp"""
+    # La caché se lee y se escribe en un hilo aparte para no bloquear las descargas
+    entries = await asyncio.to_thread(lambda: {url: _cache_entry(url) for url in urls})
+
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(sock_connect=REQUEST_TIMEOUT, sock_read=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS,
+                                     timeout=timeout) as session:
+        responses = await asyncio.gather(*[
+            _fetch(session, url, _conditional_headers(entries[url])) for url in urls
+        ])
+        bodies, stale = await asyncio.to_thread(_resolve_responses, urls, responses, entries)
+
+        if stale:
+            # 304 sin copia utilizable: se repite la petición sin cabeceras condicionales
+            responses = await asyncio.gather(*[_fetch(session, url, {}) for url in stale])
+            retried, _ = await asyncio.to_thread(_resolve_responses, stale, responses,
+                                                 {url: None for url in stale})
+            bodies.update(retried)
+
+    return bodies
+
+
+async def _fetch_all_rusty(urls: List[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+    """Descargar varias URLs en paralelo con rusty-req (red gestionada en Rust)"""
+    items = [
+        rusty_req.RequestItem(url=url, method="GET", headers=DEFAULT_HEADERS,
+                              timeout=REQUEST_TIMEOUT, tag=url)
+        for url in urls
+    ]
+    # SELECT_ALL: el fallo de una URL no invalida las demás
+    responses = await rusty_req.fetch_requests(items, mode=rusty_req.ConcurrencyMode.SELECT_ALL)
+
+    bodies = {}
+    for response in responses:
+        url = response.get("meta", {}).get("tag")
+        exception = response.get("exception") or {}
+        if exception.get("type"):
+            logger.error(f"Excepción al cargar URL {url}: {exception.get('message')}")
+        elif response.get("http_status") != 200:
+            logger.error(f"Error al obtener URL {url}: {response.get('http_status')}")
+        else:
+            # rusty-req entrega el cuerpo ya decodificado
+            bodies[url] = (response["response"]["content"], None)
+    return bodies
+
 
 class ScraperManager:
     """Gestor para múltiples scrapers"""
@@ -210,20 +686,29 @@ class ScraperManager:
     def __init__(self):
         # Mapeo de patrones de URL a clases de scraper
         self.scraper_map = {}
+        # Dominios ya resueltos (y patrones como dominio exacto) -> clase de scraper
+        self._exact_map = {}
         # Para almacenar resultados de scraping
         self.results = {}
         
     def register_scraper(self, url_pattern: str, scraper_class: type):
         """Registrar un scraper para un patrón de URL"""
         self.scraper_map[url_pattern] = scraper_class
+        # Un nuevo registro puede cambiar la resolución de dominios ya vistos
+        self._exact_map = dict(self.scraper_map)
         logger.info(f"Registrado scraper {scraper_class.__name__} para URLs que coincidan con {url_pattern}")
     
     def get_scraper_for_url(self, url: str) -> Optional[type]:
         """Obtener la clase de scraper apropiada para la URL dada"""
-        domain = urlparse(url).netloc
+        domain = _netloc(url)
+
+        scraper_class = self._exact_map.get(domain)
+        if scraper_class:
+            return scraper_class
         
         for pattern, scraper_class in self.scraper_map.items():
             if pattern in domain:
+                self._exact_map[domain] = scraper_class
                 return scraper_class
         
         logger.warning(f"No se encontró scraper para la URL: {url}")
@@ -264,6 +749,9 @@ class ScraperManager:
     
     def scrape_multiple_urls(self, urls: List[str]) -> Dict[str, List[Dict[str, Any]]]:
         """Hacer scraping de múltiples URLs"""
+        if rusty_req is not None or aiohttp is not None:
+            return asyncio.run(self.scrape_multiple_urls_async(urls))
+
         results = {}
         
         for url in urls:
@@ -271,52 +759,79 @@ class ScraperManager:
         
         self.results.update(results)
         return results
+
+    async def scrape_multiple_urls_async(self, urls: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Hacer scraping de múltiples URLs descargándolas en paralelo"""
+        results = {}
+
+        # Solo se descargan las URLs que tienen scraper (una vez cada una)
+        scrapers = {}
+        for url in dict.fromkeys(urls):
+            scraper_class = self.get_scraper_for_url(url)
+            if scraper_class:
+                scrapers[url] = scraper_class
+            else:
+                logger.error(f"No hay scraper disponible para {url}")
+                results[url] = []
+
+        bodies = await self.fetch_all_bodies(list(scrapers))
+
+        # El análisis del HTML se hace de forma secuencial
+        for url, scraper_class in scrapers.items():
+            scraper = scraper_class(url)
+            body = bodies.get(url)
+            if body is not None and scraper.load_from_html(*body):
+                results[url] = scraper.scrape()
+            else:
+                logger.error(f"No se pudo cargar la URL {url}")
+                results[url] = []
+
+        self.results.update(results)
+        return results
+
+    async def fetch_all_bodies(self, urls: List[str]) -> Dict[str, Tuple[Union[str, bytes], Optional[str]]]:
+        """Descargar en paralelo el HTML de varias URLs
+
+        Devuelve, para cada URL descargada correctamente, su contenido y el
+        charset indicado por el servidor (si se conoce). Usa rusty-req si está
+        instalado, salvo que la caché HTTP esté activa y haya aiohttp: rusty-req
+        no hace peticiones condicionales.
+        """
+        if rusty_req is not None and (not HTTP_CACHE_DIR or aiohttp is None):
+            return await _fetch_all_rusty(urls)
+        return await _fetch_all_aiohttp(urls)
     
     def export_to_json(self, filepath: str = "scraping_results.json"):
         """Exportar resultados a JSON"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, ensure_ascii=False, indent=4)
+        if orjson is not None:
+            # orjson genera directamente los bytes UTF-8 (solo admite indentación de 2)
+            data = orjson.dumps(self.results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            with open(filepath, 'wb') as f:
+                f.write(data)
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(self.results, f, ensure_ascii=False, indent=4)
         logger.info(f"Resultados exportados a {filepath}")
 
 
     def export_to_m3u(self, filepath: str = "directos_web.m3u8"):
         
         """Exportar resultados a M3U8"""
-        all_rows = []
+        lines = []
         
         for url, events in self.results.items():
+            # Extraer el dominio de la URL
+            domain = _netloc(url)
             for event in events:
-                # Extraer el dominio de la URL
-                domain = urlparse(url).netloc
+                title = event.get("title", "")
                 
-                # Para cada canal, crear una fila
-                if 'channels' in event:
-                    for channel in event.get('channels', []):
-                        row = {
-                            'source': domain,
-                            'url': url
-                        }
-                        # Añadir todos los campos del evento
-                        for key, value in event.items():
-                            if key != 'channels':  # No incluir la lista de canales
-                                row[key] = value
-                        
-                        # Añadir información del canal
-                        row['channel_name'] = channel.get('name', '')
-                        row['channel_url'] = channel.get('url', '')
-                        
-                        all_rows.append(row)
-                else:
-                    # Si no hay canales, crear una sola fila para el evento
-                    row = {
-                        'source': domain,
-                        'url': url
-                    }
-                    # Añadir todos los campos del evento
-                    for key, value in event.items():
-                        row[key] = value
-                    
-                    all_rows.append(row)
+                # Una entrada por canal (o una sola, sin canal, si el evento no tiene canales)
+                channels = event['channels'] if 'channels' in event else [{}]
+                for channel in channels:
+                    lines.append(
+                        f'#EXTINF:-1 tvg-id="" tvg-logo="" group-title="{domain}",{title} {channel.get("name", "")}\n'
+                        f'{channel.get("url", "")}\n'
+                    )
 
         #filtered_rows = []
         #if all_rows:   
@@ -334,12 +849,12 @@ class ScraperManager:
         #            f.write(f'#EXTINF:-1 tvg-id="" tvg-logo="" group-title="{row.get("source", "")}",{row.get("title", "")} {row.get("channel_name", "")}\n')
         #            f.write(self.format_url_with_headers(row.get("url_stream", ""), row.get("headers")))
             
-        if all_rows:
-            with open(filepath, "w") as f:
-                #f.write("#EXTM3U\n")
-                for row in all_rows:
-                    f.write(f'#EXTINF:-1 tvg-id="" tvg-logo="" group-title="{row.get("source", "")}",{row.get("title", "")} {row.get("channel_name", "")}\n')
-                    f.write(f'{row.get("channel_url", "")}\n')
+        if lines:
+            # Escribir todo el contenido de una sola vez, ya codificado en UTF-8
+            payload = "".join(lines).encode('utf-8')
+            with open(filepath, "wb") as f:
+                #f.write(b"#EXTM3U\n")
+                f.write(payload)
         else:
             logger.warning("No hay datos para exportar")     
 